@@ -4,11 +4,273 @@ Total War Pharaoh Dynasties - Data Extractor MVP
 Explores game directory and identifies accessible data files.
 """
 
+import mmap
 import os
 import sys
 from pathlib import Path
 from collections import defaultdict
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
+
+
+# Unit keywords as lowercase bytes, in reporting priority order - files are
+# searched as raw bytes, one lowercased window at a time
+UNIT_KEYWORDS = (b'unit', b'soldier', b'warrior', b'troop', b'battalion', b'regiment')
+
+# search_unit_data window size; consecutive windows overlap by one byte less
+# than the longest keyword so a match can't straddle a boundary unseen
+SEARCH_WINDOW_BYTES = 1024 * 1024
+_KEYWORD_OVERLAP = max(map(len, UNIT_KEYWORDS)) - 1
+
+# Potentially readable file types, in the order they are previewed
+READABLE_EXTENSIONS = ('.txt', '.xml', '.json', '.ini', '.cfg', '.no_extension')
+
+# XML previews only parse this much of each file
+XML_PREVIEW_BYTES = 64 * 1024
+
+# Files with a NUL byte this early are treated as binary and not searched
+BINARY_SNIFF_BYTES = 8 * 1024
+
+# Directory listing backend used by _scan_tree. On macOS (the default install
+# location) getattrlistbulk(2) returns names, types and sizes for hundreds of
+# entries per syscall; everywhere else os.scandir is used.
+_scandir = os.scandir
+
+if sys.platform == 'darwin':
+    import ctypes
+    import ctypes.util
+    import struct
+
+    # Constants from <sys/attr.h> / <sys/vnode.h>
+    _ATTR_BIT_MAP_COUNT = 5
+    _ATTR_CMN_NAME = 0x00000001
+    _ATTR_CMN_OBJTYPE = 0x00000008
+    _ATTR_CMN_ERROR = 0x20000000
+    _ATTR_CMN_RETURNED_ATTRS = 0x80000000
+    _ATTR_FILE_DATALENGTH = 0x00000200  # data fork only, i.e. st_size
+    _VREG = 1
+    _VDIR = 2
+    _VLNK = 5
+
+    # Reply record layout: u_int32 length + attribute_set_t (5 x u_int32),
+    # then the requested attributes in bit order
+    _RECORD_HEAD = struct.Struct('=6I')
+    _U32 = struct.Struct('=I')
+    _ATTRREF = struct.Struct('=iI')
+    _OFF_T = struct.Struct('=q')
+
+    class _AttrList(ctypes.Structure):
+        _fields_ = [
+            ('bitmapcount', ctypes.c_ushort),
+            ('reserved', ctypes.c_uint16),
+            ('commonattr', ctypes.c_uint32),
+            ('volattr', ctypes.c_uint32),
+            ('dirattr', ctypes.c_uint32),
+            ('fileattr', ctypes.c_uint32),
+            ('forkattr', ctypes.c_uint32),
+        ]
+
+    class _BulkDirEntry:
+        """Minimal os.DirEntry stand-in built from a getattrlistbulk record."""
+
+        __slots__ = ('name', 'path', 'st_size', '_objtype')
+
+        def __init__(self, name, path, objtype, size):
+            self.name = name
+            self.path = path
+            self.st_size = size
+            self._objtype = objtype
+
+        # getattrlistbulk never follows symlinks (they report VLNK), so
+        # following one falls back to a real stat() of its target
+        def is_dir(self, follow_symlinks=True):
+            if follow_symlinks and self._objtype == _VLNK:
+                return os.path.isdir(self.path)
+            return self._objtype == _VDIR
+
+        def is_file(self, follow_symlinks=True):
+            if follow_symlinks and self._objtype == _VLNK:
+                return os.path.isfile(self.path)
+            return self._objtype == _VREG
+
+        def stat(self, follow_symlinks=True):
+            if follow_symlinks and self._objtype == _VLNK:
+                return os.stat(self.path)
+            # Size came back with the listing; only st_size is exposed
+            return self
+
+    def _bulk_scandir(path):
+        """Yield _BulkDirEntry objects for path using getattrlistbulk(2)."""
+        attrs = _AttrList(
+            bitmapcount=_ATTR_BIT_MAP_COUNT,
+            commonattr=(_ATTR_CMN_RETURNED_ATTRS | _ATTR_CMN_NAME |
+                        _ATTR_CMN_ERROR | _ATTR_CMN_OBJTYPE),
+            fileattr=_ATTR_FILE_DATALENGTH,
+        )
+        buf = ctypes.create_string_buffer(64 * 1024)
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        try:
+            while True:
+                count = _getattrlistbulk(fd, ctypes.byref(attrs), buf, len(buf), 0)
+                if count < 0:
+                    err = ctypes.get_errno()
+                    raise OSError(err, os.strerror(err), path)
+                if count == 0:
+                    return
+
+                pos = 0
+                for _ in range(count):
+                    length, common, _, _, fileattr, _ = _RECORD_HEAD.unpack_from(buf, pos)
+                    field = pos + _RECORD_HEAD.size
+                    pos += length
+
+                    # ATTR_CMN_ERROR comes first after the returned-attrs set
+                    if common & _ATTR_CMN_ERROR:
+                        if _U32.unpack_from(buf, field)[0]:
+                            continue
+                        field += _U32.size
+
+                    # attrreference_t offset is relative to the reference itself
+                    name_off, name_len = _ATTRREF.unpack_from(buf, field)
+                    name_start = field + name_off
+                    name = buf[name_start:name_start + name_len - 1].decode('utf-8', 'surrogateescape')
+                    field += _ATTRREF.size
+
+                    objtype = _U32.unpack_from(buf, field)[0]
+                    field += _U32.size
+
+                    size = 0
+                    if fileattr & _ATTR_FILE_DATALENGTH:
+                        size = _OFF_T.unpack_from(buf, field)[0]
+
+                    yield _BulkDirEntry(name, os.path.join(path, name), objtype, size)
+        finally:
+            os.close(fd)
+
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        _getattrlistbulk = _libc.getattrlistbulk  # macOS 10.10+
+        _getattrlistbulk.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p,
+                                     ctypes.c_size_t, ctypes.c_uint64]
+        _getattrlistbulk.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        pass
+    else:
+        def _scandir(path):
+            return closing(_bulk_scandir(path))
+
+
+def _scan_tree(root, recursive=True):
+    """
+    Walk a directory tree with os.scandir and bucket its files by extension.
+
+    Returns (categories, pack_files, subdirs), where pack_files holds
+    (size, path) tuples. With recursive=False only the files directly in
+    root are collected and its subdirectories are returned instead of
+    walked. Uses only local state, so it is safe to run in a thread.
+    """
+    categories = defaultdict(list)
+    pack_files = []
+    subdirs = []
+
+    # Iterative DFS - DirEntry caches the dirent type (and getattrlistbulk
+    # returns it inline), so classifying a regular file needs no stat() call;
+    # only symlinks are stat()ed to classify, and only .pack files for size
+    # Symlinked directories are not descended into, but symlinked files
+    # are counted with their target's size, as rglob('*') + is_file() did
+    stack = [root]
+    while stack:
+        try:
+            with _scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            (stack if recursive else subdirs).append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+
+                        ext = os.path.splitext(entry.name)[1].lower() or '.no_extension'
+
+                        # Track .pack files separately, sized once here so
+                        # analysis and the report never stat() them again
+                        if ext == '.pack':
+                            pack_files.append((entry.stat().st_size, entry.path))
+                    except OSError:
+                        # Symlink loop, unreadable target or a file removed
+                        # since readdir - skip just this entry
+                        continue
+
+                    categories[ext].append(entry.path)
+        except OSError:
+            # Unreadable directory - skip it and keep walking, as rglob and
+            # os.walk do
+            continue
+
+    return categories, pack_files, subdirs
+
+
+def _first_unit_keyword(data):
+    """
+    Return the highest-priority UNIT_KEYWORDS entry found in data, or None.
+
+    Same answer as checking each keyword in order against the whole
+    lowercased file, but only one window is lowercased at a time. Stops
+    early once the first keyword turns up.
+    """
+    best = len(UNIT_KEYWORDS)
+    for start in range(0, len(data), SEARCH_WINDOW_BYTES):
+        window = data[start:start + SEARCH_WINDOW_BYTES + _KEYWORD_OVERLAP].lower()
+        # Only keywords that would beat the current best are worth checking
+        for i in range(best):
+            if UNIT_KEYWORDS[i] in window:
+                best = i
+                break
+        if best == 0:
+            break
+
+    if best < len(UNIT_KEYWORDS):
+        return UNIT_KEYWORDS[best].decode('ascii')
+    return None
+
+
+def _xml_root_summary(file_path, limit=XML_PREVIEW_BYTES):
+    """
+    Return (root_tag, child_count, complete) for an XML file.
+
+    Only the first `limit` bytes are fed to an incremental parser. If the
+    root element does not close within them, complete is False and
+    child_count is a lower bound.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(limit + 1)
+
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    parser.feed(head[:limit])
+    if len(head) <= limit:
+        parser.close()  # Whole document seen - surface malformed XML
+
+    root_tag = None
+    child_count = 0
+    depth = 0
+
+    for event, elem in parser.read_events():
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                root_tag = elem.tag
+            elif depth == 2:
+                child_count += 1
+        else:
+            depth -= 1
+            elem.clear()
+
+    if root_tag is None:
+        raise ET.ParseError(f"no root element in first {limit} bytes")
+
+    return root_tag, child_count, depth == 0
 
 
 class GameDataExplorer:
@@ -18,7 +280,15 @@ class GameDataExplorer:
         self.game_path = Path(game_data_path)
         self.file_categories = defaultdict(list)
         self.readable_files = []
-        self.pack_files = []
+        self.pack_files = []  # (size, path) tuples, largest first
+
+        # Scanned paths are plain strings under this prefix; relative paths
+        # are a slice of it rather than a Path/relpath round-trip per file
+        self._root_prefix = os.path.join(str(self.game_path), '')
+
+    def _relpath(self, path):
+        """Path of a scanned file relative to the game data directory."""
+        return path[len(self._root_prefix):]
 
     def explore(self):
         """Main exploration method."""
@@ -54,16 +324,32 @@ class GameDataExplorer:
     def scan_directory(self):
         """Recursively scan the game directory."""
         try:
-            for item in self.game_path.rglob('*'):
-                if item.is_file():
-                    ext = item.suffix.lower()
-                    if not ext:
-                        ext = '.no_extension'
-                    self.file_categories[ext].append(item)
-
-                    # Track .pack files separately
-                    if ext == '.pack':
-                        self.pack_files.append(item)
+            # Files directly in the data dir are collected here; each top-level
+            # subdirectory is walked by its own worker so readdir latency overlaps
+            top = _scan_tree(str(self.game_path), recursive=False)
+            subdirs = top[2]
+
+            results = [top]
+            if subdirs:
+                with ThreadPoolExecutor(max_workers=min(32, len(subdirs))) as pool:
+                    futures = [(subdir, pool.submit(_scan_tree, subdir)) for subdir in subdirs]
+
+                # Collect each subtree on its own so one failing worker
+                # doesn't discard what the others found
+                for subdir, future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        print(f"⚠️  Skipped {self._relpath(subdir)}: {e}")
+
+            # Merge after join - workers never touch shared state
+            for categories, pack_files, _ in results:
+                for ext, files in categories.items():
+                    self.file_categories[ext].extend(files)
+                self.pack_files.extend(pack_files)
+
+            # Largest first - reused by analyze_pack_files and generate_report
+            self.pack_files.sort(reverse=True)
 
             total_files = sum(len(files) for files in self.file_categories.values())
             print(f"✅ Found {total_files} files in {len(self.file_categories)} categories")
@@ -90,31 +376,31 @@ class GameDataExplorer:
 
     def read_accessible_files(self):
         """Try to read text and XML files."""
-        # Focus on potentially readable files
-        readable_extensions = ['.txt', '.xml', '.json', '.ini', '.cfg', '.no_extension']
-
         files_read = 0
-        for ext in readable_extensions:
-            if ext not in self.file_categories:
+        for ext in READABLE_EXTENSIONS:
+            # .get() rather than [] so the defaultdict isn't grown
+            files = self.file_categories.get(ext)
+            if not files:
                 continue
 
-            for file_path in self.file_categories[ext][:5]:  # Read first 5 of each type
+            for file_path in islice(files, 5):  # Read first 5 of each type
                 try:
-                    rel_path = file_path.relative_to(self.game_path)
+                    rel_path = self._relpath(file_path)
 
                     # Try reading as text
                     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        size = os.fstat(f.fileno()).st_size
                         content = f.read(1000)  # Read first 1000 chars
 
                     print(f"\n  📄 {rel_path}")
-                    print(f"     Size: {file_path.stat().st_size} bytes")
+                    print(f"     Size: {size} bytes")
 
                     if ext == '.xml':
                         # Try parsing as XML
                         try:
-                            tree = ET.parse(file_path)
-                            root = tree.getroot()
-                            print(f"     XML Root: <{root.tag}> with {len(root)} children")
+                            root_tag, child_count, complete = _xml_root_summary(file_path)
+                            more = '' if complete else '+'
+                            print(f"     XML Root: <{root_tag}> with {child_count}{more} children")
                         except:
                             print(f"     Preview: {content[:100]}...")
                     else:
@@ -141,19 +427,18 @@ class GameDataExplorer:
 
         print(f"  Found {len(self.pack_files)} .pack files:")
 
-        # Sort by size
-        sorted_packs = sorted(self.pack_files, key=lambda x: x.stat().st_size, reverse=True)
+        # Already sorted by size during the scan
+        sorted_packs = self.pack_files
 
         total_size = 0
-        for pack_file in sorted_packs[:10]:  # Show top 10
-            size = pack_file.stat().st_size
+        for size, pack_file in sorted_packs[:10]:  # Show top 10
             total_size += size
             size_mb = size / (1024 * 1024)
-            rel_path = pack_file.relative_to(self.game_path)
+            rel_path = self._relpath(pack_file)
             print(f"    {size_mb:8.1f} MB - {rel_path}")
 
         if len(sorted_packs) > 10:
-            remaining_size = sum(p.stat().st_size for p in sorted_packs[10:])
+            remaining_size = sum(size for size, _ in sorted_packs[10:])
             total_size += remaining_size
             print(f"    ... and {len(sorted_packs) - 10} more files ({remaining_size / (1024*1024):.1f} MB)")
 
@@ -162,20 +447,26 @@ class GameDataExplorer:
 
     def search_unit_data(self):
         """Search for unit-related data in accessible files."""
-        unit_keywords = ['unit', 'soldier', 'warrior', 'troop', 'battalion', 'regiment']
         findings = []
 
-        # Search in readable files
+        # Search in readable files - mmap'd raw bytes, lowercased a window at
+        # a time so memory stays bounded and `in` gets the fast substring search
         for file_path in self.readable_files:
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().lower()
+                with open(file_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        continue  # mmap rejects empty files
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # A NUL in the head means binary (e.g. .DS_Store) - skip
+                        # it before scanning, as grep/ripgrep do
+                        if mm.find(b'\x00', 0, BINARY_SNIFF_BYTES) != -1:
+                            continue
+
+                        keyword = _first_unit_keyword(mm)
 
-                for keyword in unit_keywords:
-                    if keyword in content:
-                        rel_path = file_path.relative_to(self.game_path)
-                        findings.append((rel_path, keyword))
-                        break
+                if keyword:
+                    rel_path = self._relpath(file_path)
+                    findings.append((rel_path, keyword))
 
             except:
                 pass
@@ -192,54 +483,58 @@ class GameDataExplorer:
         """Generate a findings report."""
         report_path = Path(__file__).parent / output_file
 
-        with open(report_path, 'w') as f:
-            f.write("# Total War Pharaoh Dynasties - Data Exploration Findings\n\n")
-            f.write(f"**Explored Path:** `{self.game_path}`\n\n")
+        # Build the whole report in memory and write it out once
+        parts = []
+        append = parts.append
 
-            # File statistics
-            f.write("## File Statistics\n\n")
-            total_files = sum(len(files) for files in self.file_categories.values())
-            f.write(f"- **Total Files:** {total_files}\n")
-            f.write(f"- **File Types:** {len(self.file_categories)}\n")
-            f.write(f"- **Pack Files:** {len(self.pack_files)}\n\n")
-
-            # Categories
-            f.write("## File Categories (Top 10)\n\n")
-            f.write("| Extension | Count |\n")
-            f.write("|-----------|-------|\n")
-            sorted_categories = sorted(
-                self.file_categories.items(),
-                key=lambda x: len(x[1]),
-                reverse=True
+        append("# Total War Pharaoh Dynasties - Data Exploration Findings\n\n")
+        append(f"**Explored Path:** `{self.game_path}`\n\n")
+
+        # File statistics
+        append("## File Statistics\n\n")
+        total_files = sum(len(files) for files in self.file_categories.values())
+        append(f"- **Total Files:** {total_files}\n")
+        append(f"- **File Types:** {len(self.file_categories)}\n")
+        append(f"- **Pack Files:** {len(self.pack_files)}\n\n")
+
+        # Categories
+        append("## File Categories (Top 10)\n\n")
+        append("| Extension | Count |\n")
+        append("|-----------|-------|\n")
+        sorted_categories = sorted(
+            self.file_categories.items(),
+            key=lambda x: len(x[1]),
+            reverse=True
+        )
+        parts.extend(f"| `{ext}` | {len(files)} |\n" for ext, files in sorted_categories[:10])
+
+        # Readable files
+        append("\n## Accessible Files\n\n")
+        if self.readable_files:
+            parts.extend(
+                f"- `{self._relpath(file_path)}`\n"
+                for file_path in self.readable_files
             )
-            for ext, files in sorted_categories[:10]:
-                f.write(f"| `{ext}` | {len(files)} |\n")
-
-            # Readable files
-            f.write("\n## Accessible Files\n\n")
-            if self.readable_files:
-                for file_path in self.readable_files:
-                    rel_path = file_path.relative_to(self.game_path)
-                    f.write(f"- `{rel_path}`\n")
-            else:
-                f.write("*No easily readable files found.*\n")
-
-            # Pack files
-            f.write("\n## Pack Files (Largest 10)\n\n")
-            sorted_packs = sorted(self.pack_files, key=lambda x: x.stat().st_size, reverse=True)
-            f.write("| Size (MB) | File |\n")
-            f.write("|-----------|------|\n")
-            for pack_file in sorted_packs[:10]:
-                size_mb = pack_file.stat().st_size / (1024 * 1024)
-                rel_path = pack_file.relative_to(self.game_path)
-                f.write(f"| {size_mb:.1f} | `{rel_path}` |\n")
-
-            # Next steps
-            f.write("\n## Next Steps\n\n")
-            f.write("1. **Install RPFM** - Tool to extract .pack files\n")
-            f.write("2. **Extract key .pack files** - Focus on largest files likely containing unit data\n")
-            f.write("3. **Locate unit tables** - Look for database tables with unit stats\n")
-            f.write("4. **Parse extracted data** - Build parser for extracted tables\n")
+        else:
+            append("*No easily readable files found.*\n")
+
+        # Pack files
+        append("\n## Pack Files (Largest 10)\n\n")
+        append("| Size (MB) | File |\n")
+        append("|-----------|------|\n")
+        parts.extend(
+            f"| {size / (1024 * 1024):.1f} | `{self._relpath(pack_file)}` |\n"
+            for size, pack_file in self.pack_files[:10]
+        )
+
+        # Next steps
+        append("\n## Next Steps\n\n")
+        append("1. **Install RPFM** - Tool to extract .pack files\n")
+        append("2. **Extract key .pack files** - Focus on largest files likely containing unit data\n")
+        append("3. **Locate unit tables** - Look for database tables with unit stats\n")
+        append("4. **Parse extracted data** - Build parser for extracted tables\n")
+
+        report_path.write_text(''.join(parts), encoding='utf-8')
 
         print(f"\n💾 Report saved to: {report_path}")
 
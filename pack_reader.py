@@ -4,15 +4,136 @@ Total War Pack File Reader (PFH5 Format)
 Based on TotalWar-Modding/docs pack file format specification.
 """
 
+import mmap
+import os
 import struct
 import sys
+from array import array
+from collections import Counter, defaultdict
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence
+
+
+# PFH5 header: preamble + 7 little-endian u32 fields (32 bytes)
+_HEADER = struct.Struct('<4s7I')
+
+# extract_many prefetches pack data in groups of roughly this many bytes
+READ_GROUP_BYTES = 8 * 1024 * 1024
+
+# sendfile(2) into a regular file is only supported on Linux (macOS needs a
+# socket as the destination and Windows has no os.sendfile)
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+
+def _extension(path: str) -> str:
+    """
+    Lowercased extension of a pack path, or '.no_extension'.
+
+    Same result as Path(path).suffix.lower() for '/'-separated pack paths,
+    without building a Path object per entry.
+    """
+    dot = path.rfind('.')
+    # The dot must fall inside the final component, not start or end it
+    if path.rfind('/') + 1 < dot < len(path) - 1:
+        return path[dot:].lower()
+    return '.no_extension'
+
+
+def _scan_file_index(
+    data: bytes, count: int, has_timestamps: bool, data_padded: bool
+) -> Tuple[List[bytes], Sequence[int], List[int], Sequence[Optional[int]]]:
+    """
+    Scan a raw PFH5 file index into parallel columns.
+
+    Returns (raw_paths, sizes, offsets, timestamps) for every complete
+    record, stopping early on a truncated index. Paths are left as bytes
+    for the caller to decode. A pure function over the index buffer, so
+    it is the single place a faster scanner would plug in.
+    """
+    # Pass 1: walk the records only to find path boundaries, collecting
+    # the raw path bytes and the fixed-size numeric tail of each record
+    tail_size = 8 if has_timestamps else 4  # size [+ timestamp]
+    index_len = len(data)
+    raw_paths = []
+    tails = []
+    pos = 0
+
+    # The pack flags only change tail_size, fixed above, so the loop has no
+    # per-record flag checks; bind the methods it calls to locals as well
+    find = data.find
+    add_path = raw_paths.append
+    add_tail = tails.append
+
+    for _ in range(count):
+        # Skip prefix byte (always 0x00)
+        pos += 1
+        if pos >= index_len:
+            break
+
+        # Null-terminated file path, then size (and timestamp if present)
+        path_end = find(b'\x00', pos)
+        if path_end == -1:
+            break
+
+        tail_start = path_end + 1
+        tail_end = tail_start + tail_size
+        if tail_end > index_len:
+            break
+
+        add_path(data[pos:path_end])
+        add_tail(data[tail_start:tail_end])
+        pos = tail_end
+
+    # Pass 2: decode every numeric field with one bulk unpack
+    found = len(raw_paths)
+    values = struct.unpack(f'<{found * (tail_size // 4)}I', b''.join(tails))
+    if has_timestamps:
+        sizes = values[0::2]
+        timestamps = values[1::2]
+    else:
+        sizes = values
+        timestamps = [None] * found
+
+    # Data offsets are the running sum of (optionally 8-byte padded) sizes
+    if data_padded:
+        steps = [((size + 7) // 8) * 8 for size in sizes]
+    else:
+        steps = sizes
+    offsets = list(accumulate(steps, initial=0))[:-1]
+
+    return raw_paths, sizes, offsets, timestamps
+
+
+def _span(entries: List['PackFileEntry']) -> int:
+    """Bytes from the first entry's data to the end of the last one's."""
+    return entries[-1].offset + entries[-1].size - entries[0].offset
+
+
+def _coalesce(entries: List['PackFileEntry'], limit: int) -> List[List['PackFileEntry']]:
+    """
+    Group offset-sorted entries into runs spanning at most limit bytes.
+
+    An entry larger than limit gets a group of its own.
+    """
+    groups = []
+    group = []
+    for entry in entries:
+        if group and entry.offset + entry.size - group[0].offset > limit:
+            groups.append(group)
+            group = []
+        group.append(entry)
+    if group:
+        groups.append(group)
+    return groups
 
 
 class PackFileEntry:
     """Represents a single file entry in the pack."""
 
+    # No per-instance __dict__ - packs can hold hundreds of thousands of entries
+    __slots__ = ('path', 'size', 'offset', 'timestamp')
+
     def __init__(self, path: str, size: int, offset: int, timestamp: Optional[int] = None):
         self.path = path
         self.size = size
@@ -45,54 +166,93 @@ class PFH5Reader:
         self.entries: List[PackFileEntry] = []
         self.file_data_offset = 0
 
+        # Index columns used by whole-pack scans, filled alongside entries -
+        # paths share the entries' str objects, sizes is a compact u32 array
+        self.paths: List[str] = []
+        self.sizes = array('I')
+
+        # Per-entry extensions and get_file_info's (total_size, extensions)
+        # aggregate, derived once per index read
+        self._extensions: List[str] = []
+        self._info_cache: Optional[Tuple[int, Dict]] = None
+
+        # Lowercased paths for list_files pattern matching, built on first use
+        self._paths_lower: Optional[List[str]] = None
+
+        # Opened and mapped lazily, then shared by header/index/extract reads
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+
         if not self.pack_path.exists():
             raise FileNotFoundError(f"Pack file not found: {pack_path}")
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap and close the pack file."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _map(self) -> mmap.mmap:
+        """Return a read-only mapping of the whole pack, creating it on first use."""
+        if self._mm is None:
+            f = open(self.pack_path, 'rb')
+            try:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ValueError("Invalid pack file: header too short")
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except BaseException:
+                f.close()
+                raise
+            self._file = f
+        return self._mm
+
     def read_header(self) -> Dict:
         """Read and parse the 32-byte PFH5 header."""
-        with open(self.pack_path, 'rb') as f:
-            # Read 32-byte header (8 fields x 4 bytes)
-            header_data = f.read(32)
-
-            if len(header_data) < 32:
-                raise ValueError("Invalid pack file: header too short")
-
-            # Parse header fields
-            preamble = header_data[0:4]
-            if preamble != b'PFH5':
-                raise ValueError(f"Invalid pack file: expected PFH5, got {preamble}")
-
-            # Unpack header fields (little-endian)
-            type_bitmask = struct.unpack('<I', header_data[4:8])[0]
-            pf_index_count = struct.unpack('<I', header_data[8:12])[0]
-            pf_index_size = struct.unpack('<I', header_data[12:16])[0]
-            file_index_count = struct.unpack('<I', header_data[16:20])[0]
-            file_index_size = struct.unpack('<I', header_data[20:24])[0]
-            timestamp = struct.unpack('<I', header_data[24:28])[0]
-            signature_pos = struct.unpack('<I', header_data[28:32])[0]
-
-            # Extract pack type and flags
-            pack_type = type_bitmask & 0x0F
-            flags = type_bitmask & 0xFFFFFFF0
-
-            self.header = {
-                'preamble': preamble.decode('ascii'),
-                'pack_type': pack_type,
-                'type_bitmask': type_bitmask,
-                'flags': flags,
-                'pf_index_count': pf_index_count,
-                'pf_index_size': pf_index_size,
-                'file_index_count': file_index_count,
-                'file_index_size': file_index_size,
-                'timestamp': timestamp,
-                'signature_pos': signature_pos,
-                'has_extended_header': bool(flags & self.FLAG_EXTENDED_HEADER),
-                'index_encrypted': bool(flags & self.FLAG_INDEX_ENCRYPTED),
-                'has_timestamps': bool(flags & self.FLAG_TIMESTAMP_IN_INDEX),
-                'data_padded': bool(flags & self.FLAG_DATA_PADDED),
-            }
-
-            return self.header
+        # Read 32-byte header (8 fields x 4 bytes)
+        header_data = self._map()[0:32]
+
+        if len(header_data) < 32:
+            raise ValueError("Invalid pack file: header too short")
+
+        # Unpack all header fields in one call (little-endian)
+        (preamble, type_bitmask, pf_index_count, pf_index_size, file_index_count,
+         file_index_size, timestamp, signature_pos) = _HEADER.unpack(header_data)
+
+        if preamble != b'PFH5':
+            raise ValueError(f"Invalid pack file: expected PFH5, got {preamble}")
+
+        # Extract pack type and flags
+        pack_type = type_bitmask & 0x0F
+        flags = type_bitmask & 0xFFFFFFF0
+
+        self.header = {
+            'preamble': preamble.decode('ascii'),
+            'pack_type': pack_type,
+            'type_bitmask': type_bitmask,
+            'flags': flags,
+            'pf_index_count': pf_index_count,
+            'pf_index_size': pf_index_size,
+            'file_index_count': file_index_count,
+            'file_index_size': file_index_size,
+            'timestamp': timestamp,
+            'signature_pos': signature_pos,
+            'has_extended_header': bool(flags & self.FLAG_EXTENDED_HEADER),
+            'index_encrypted': bool(flags & self.FLAG_INDEX_ENCRYPTED),
+            'has_timestamps': bool(flags & self.FLAG_TIMESTAMP_IN_INDEX),
+            'data_padded': bool(flags & self.FLAG_DATA_PADDED),
+        }
+        self._info_cache = None
+
+        return self.header
 
     def read_file_index(self) -> List[PackFileEntry]:
         """Read and parse the file index."""
@@ -103,71 +263,47 @@ class PFH5Reader:
             print("⚠️  WARNING: File index is encrypted - cannot read without decryption")
             return []
 
-        with open(self.pack_path, 'rb') as f:
-            # Skip header (32 bytes) and extended header if present
-            header_size = 32
-            if self.header['has_extended_header']:
-                header_size += 20
-
-            # Skip PF index (we don't need it for simple extraction)
-            f.seek(header_size + self.header['pf_index_size'])
-
-            # Read file index
-            file_index_data = f.read(self.header['file_index_size'])
-
-            # Parse file entries
-            entries = []
-            current_offset = 0
-            pos = 0
-
-            for _ in range(self.header['file_index_count']):
-                if pos >= len(file_index_data):
-                    break
-
-                # Skip prefix byte (always 0x00)
-                pos += 1
-                if pos >= len(file_index_data):
-                    break
-
-                # Read null-terminated file path
-                path_end = file_index_data.find(b'\x00', pos)
-                if path_end == -1:
-                    break
-
-                file_path = file_index_data[pos:path_end].decode('utf-8', errors='ignore')
-                pos = path_end + 1
-
-                # Read size (4 bytes, comes AFTER path)
-                if pos + 4 > len(file_index_data):
-                    break
-                size = struct.unpack('<I', file_index_data[pos:pos+4])[0]
-                pos += 4
-
-                # Read timestamp if present (4 bytes)
-                timestamp = None
-                if self.header['has_timestamps']:
-                    if pos + 4 > len(file_index_data):
-                        break
-                    timestamp = struct.unpack('<I', file_index_data[pos:pos+4])[0]
-                    pos += 4
+        # Skip header (32 bytes) and extended header if present
+        header_size = 32
+        if self.header['has_extended_header']:
+            header_size += 20
+
+        # Skip PF index (we don't need it for simple extraction)
+        index_start = header_size + self.header['pf_index_size']
+
+        # Copy the file index out of the mapping once - bytes gives fast find()
+        # and slicing, and doesn't pin an exported buffer on the map
+        file_index_data = self._map()[index_start:index_start + self.header['file_index_size']]
+
+        raw_paths, sizes, offsets, timestamps = _scan_file_index(
+            file_index_data,
+            self.header['file_index_count'],
+            self.header['has_timestamps'],
+            self.header['data_padded'],
+        )
+
+        # Decode every path with one decoder call - NUL never occurs inside
+        # a path, so it is a safe separator to split the result on again
+        if raw_paths:
+            self.paths = b'\x00'.join(raw_paths).decode('utf-8', errors='ignore').split('\x00')
+        else:
+            self.paths = []
+        self.sizes = array('I', sizes)
+        self._extensions = list(map(_extension, self.paths))
+        self._info_cache = None
+        self._paths_lower = None
 
-                # Create entry
-                entry = PackFileEntry(file_path, size, current_offset, timestamp)
-                entries.append(entry)
+        entries = [
+            PackFileEntry(path, size, offset, timestamp)
+            for path, size, offset, timestamp in zip(self.paths, sizes, offsets, timestamps)
+        ]
 
-                # Calculate next offset (with padding if enabled)
-                if self.header['data_padded']:
-                    # Pad to 8-byte boundary
-                    current_offset += ((size + 7) // 8) * 8
-                else:
-                    current_offset += size
+        self.entries = entries
 
-            self.entries = entries
+        # Calculate where file data starts
+        self.file_data_offset = header_size + self.header['pf_index_size'] + self.header['file_index_size']
 
-            # Calculate where file data starts
-            self.file_data_offset = header_size + self.header['pf_index_size'] + self.header['file_index_size']
-
-            return entries
+        return entries
 
     def list_files(self, pattern: Optional[str] = None) -> List[PackFileEntry]:
         """List all files in the pack, optionally filtered by pattern."""
@@ -175,54 +311,159 @@ class PFH5Reader:
             self.read_file_index()
 
         if pattern:
+            if self._paths_lower is None:
+                self._paths_lower = [path.lower() for path in self.paths]
             pattern_lower = pattern.lower()
-            return [e for e in self.entries if pattern_lower in e.path.lower()]
+            return [e for e, path in zip(self.entries, self._paths_lower) if pattern_lower in path]
 
         return self.entries
 
-    def extract_file(self, entry: PackFileEntry, output_path: Optional[Path] = None) -> bytes:
-        """Extract a single file from the pack."""
+    def extract_file(self, entry: PackFileEntry, output_path: Optional[Path] = None) -> Optional[bytes]:
+        """
+        Extract a single file from the pack.
+
+        Returns the file's bytes, or None when output_path is given - the
+        data is then copied straight to disk instead of through Python.
+        """
         if not self.entries:
             self.read_file_index()
 
-        with open(self.pack_path, 'rb') as f:
-            # Seek to file data
-            f.seek(self.file_data_offset + entry.offset)
-            data = f.read(entry.size)
+        start = self.file_data_offset + entry.offset
 
         # Optionally write to file
         if output_path:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'wb') as f:
-                f.write(data)
+            os.makedirs(output_path.parent, exist_ok=True)
+            self._copy_to_file(start, entry.size, output_path)
+            return None
+
+        # Slice file data straight out of the mapping
+        return self._map()[start:start + entry.size]
+
+    def extract_many(self, entries: List[PackFileEntry], output_dir: Path, max_workers: Optional[int] = None) -> int:
+        """
+        Extract several files under output_dir in one sequential pass.
+
+        Entries are taken in pack order, so reads move monotonically
+        through the file and kernel readahead can work. Files within each
+        read group are written by a pool of max_workers threads (default:
+        CPU count, at most 8) to keep several copies in flight. Returns
+        the number of files written.
+        """
+        # Only bulk extraction needs the pool; keep it off the CLI import path
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not self.entries:
+            self.read_file_index()
 
-        return data
+        entries = sorted(entries, key=lambda e: e.offset)
+        if not entries:
+            return 0
+
+        base = self.file_data_offset
+        self._advise(base + entries[0].offset, _span(entries), 'SEQUENTIAL')
+
+        # Coalesce neighbouring entries into ~8 MiB groups and prefetch the
+        # next group while the current one is written, so the disk sees a
+        # few large reads instead of one small read per file
+        groups = _coalesce(entries, READ_GROUP_BYTES)
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+
+        # Directories created during this call, so each gets one makedirs
+        # instead of a mkdir per file; scoped to the call so a directory
+        # removed afterwards is recreated next time
+        dirs_seen = set()
+
+        def write(entry: PackFileEntry):
+            # sendfile and mmap slicing both take explicit offsets, so
+            # threads never share a file position
+            output_path = os.path.join(output_dir, entry.path)
+            parent = os.path.dirname(output_path)
+            if parent and parent not in dirs_seen:
+                os.makedirs(parent, exist_ok=True)
+                dirs_seen.add(parent)
+            self._copy_to_file(base + entry.offset, entry.size, output_path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for i, group in enumerate(groups):
+                if i + 1 < len(groups):
+                    ahead = groups[i + 1]
+                    self._advise(base + ahead[0].offset, _span(ahead), 'WILLNEED')
+
+                # Drain the group before moving on so reads stay in order;
+                # list() also re-raises the first worker error
+                list(pool.map(write, group))
+
+        return len(entries)
+
+    def _advise(self, start: int, length: int, advice: str):
+        """
+        Hint the kernel about how [start, start + length) will be read.
+
+        advice is the suffix shared by the posix_fadvise and madvise
+        constants, e.g. 'SEQUENTIAL' or 'WILLNEED'.
+        """
+        mm = self._map()
+        if length <= 0:
+            return
+
+        if _USE_SENDFILE:
+            # sendfile reads through the file descriptor
+            os.posix_fadvise(self._file.fileno(), start, length, getattr(os, 'POSIX_FADV_' + advice))
+        elif hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_' + advice):
+            # Fallback copies read through the mapping; madvise wants a
+            # page-aligned start and a range inside the map
+            aligned = start - start % mmap.PAGESIZE
+            if aligned < len(mm):
+                length = min(length + start - aligned, len(mm) - aligned)
+                mm.madvise(getattr(mmap, 'MADV_' + advice), aligned, length)
+
+    def _copy_to_file(self, start: int, size: int, output_path: Path):
+        """Copy size bytes at start in the pack into output_path."""
+        mm = self._map()
+
+        with open(output_path, 'wb') as f:
+            if _USE_SENDFILE:
+                # In-kernel copy from the pack's page cache - no userspace buffer
+                src_fd = self._file.fileno()
+                dst_fd = f.fileno()
+                offset = start
+                remaining = size
+                while remaining:
+                    sent = os.sendfile(dst_fd, src_fd, offset, remaining)
+                    if not sent:
+                        break  # Pack is shorter than its index claims
+                    offset += sent
+                    remaining -= sent
+            else:
+                # Write from the mapping without an intermediate bytes copy
+                with memoryview(mm) as view:
+                    f.write(view[start:start + size])
 
     def get_file_info(self) -> Dict:
         """Get summary information about the pack file."""
         if not self.entries:
             self.read_file_index()
 
-        # Categorize files by extension
-        extensions = {}
-        total_size = 0
+        if self._info_cache is None:
+            # Categorize files by extension
+            counts = Counter(self._extensions)
+            sizes = defaultdict(int)
 
-        for entry in self.entries:
-            ext = Path(entry.path).suffix.lower()
-            if not ext:
-                ext = '.no_extension'
+            for ext, size in zip(self._extensions, self.sizes):
+                sizes[ext] += size
 
-            if ext not in extensions:
-                extensions[ext] = {'count': 0, 'size': 0}
+            extensions = {ext: {'count': count, 'size': sizes[ext]} for ext, count in counts.items()}
+            self._info_cache = (sum(self.sizes), extensions)
 
-            extensions[ext]['count'] += 1
-            extensions[ext]['size'] += entry.size
-            total_size += entry.size
+        total_size, extensions = self._info_cache
 
+        # Fresh dicts per call (one per extension, not per entry) so callers
+        # can't mutate the cached aggregate
         return {
             'file_count': len(self.entries),
             'total_size': total_size,
-            'extensions': extensions,
+            'extensions': {ext: dict(stats) for ext, stats in extensions.items()},
             'header': self.header,
         }
 
@@ -242,80 +483,83 @@ def main():
     command = sys.argv[2] if len(sys.argv) > 2 else 'info'
 
     try:
-        reader = PFH5Reader(pack_file)
-
-        if command == 'info':
-            print(f"📦 Pack File: {pack_file}")
-            print("=" * 80)
-
-            reader.read_header()
-            print("\n📋 HEADER INFO:")
-            print(f"  Format: {reader.header['preamble']}")
-            print(f"  Pack Type: {reader.header['pack_type']}")
-            print(f"  File Count: {reader.header['file_index_count']}")
-            print(f"  Encrypted: {reader.header['index_encrypted']}")
-            print(f"  Has Timestamps: {reader.header['has_timestamps']}")
-
-            if not reader.header['index_encrypted']:
-                info = reader.get_file_info()
-                print(f"\n📊 FILE STATISTICS:")
-                print(f"  Total Files: {info['file_count']}")
-                print(f"  Total Size: {info['total_size'] / (1024*1024):.1f} MB")
-
-                print(f"\n📁 FILE TYPES (Top 10):")
-                sorted_exts = sorted(
-                    info['extensions'].items(),
-                    key=lambda x: x[1]['count'],
-                    reverse=True
-                )
-                for ext, data in sorted_exts[:10]:
-                    size_mb = data['size'] / (1024 * 1024)
-                    print(f"  {ext:20s} : {data['count']:6d} files ({size_mb:8.1f} MB)")
-
-        elif command == 'list':
-            pattern = sys.argv[3] if len(sys.argv) > 3 else None
-            entries = reader.list_files(pattern)
-
-            if pattern:
-                print(f"📋 Files matching '{pattern}': {len(entries)}")
-            else:
-                print(f"📋 All files: {len(entries)}")
-
-            print("=" * 80)
-            for entry in entries[:100]:  # Limit to first 100
-                size_kb = entry.size / 1024
-                print(f"  {size_kb:10.1f} KB - {entry.path}")
-
-            if len(entries) > 100:
-                print(f"\n... and {len(entries) - 100} more files")
-
-        elif command == 'extract':
-            if len(sys.argv) < 4:
-                print("Error: Please specify file to extract")
-                sys.exit(1)
+        with PFH5Reader(pack_file) as reader:
+            if command == 'info':
+                print(f"📦 Pack File: {pack_file}")
+                print("=" * 80)
+
+                reader.read_header()
+                print("\n📋 HEADER INFO:")
+                print(f"  Format: {reader.header['preamble']}")
+                print(f"  Pack Type: {reader.header['pack_type']}")
+                print(f"  File Count: {reader.header['file_index_count']}")
+                print(f"  Encrypted: {reader.header['index_encrypted']}")
+                print(f"  Has Timestamps: {reader.header['has_timestamps']}")
+
+                if not reader.header['index_encrypted']:
+                    info = reader.get_file_info()
+                    print(f"\n📊 FILE STATISTICS:")
+                    print(f"  Total Files: {info['file_count']}")
+                    print(f"  Total Size: {info['total_size'] / (1024*1024):.1f} MB")
+
+                    print(f"\n📁 FILE TYPES (Top 10):")
+                    sorted_exts = sorted(
+                        info['extensions'].items(),
+                        key=lambda x: x[1]['count'],
+                        reverse=True
+                    )
+                    lines = [
+                        f"  {ext:20s} : {data['count']:6d} files ({data['size'] / (1024 * 1024):8.1f} MB)"
+                        for ext, data in sorted_exts[:10]
+                    ]
+                    if lines:
+                        sys.stdout.write('\n'.join(lines) + '\n')
+
+            elif command == 'list':
+                pattern = sys.argv[3] if len(sys.argv) > 3 else None
+                entries = reader.list_files(pattern)
+
+                if pattern:
+                    print(f"📋 Files matching '{pattern}': {len(entries)}")
+                else:
+                    print(f"📋 All files: {len(entries)}")
+
+                print("=" * 80)
+                # Limit to first 100, written as one block instead of a print per line
+                lines = [f"  {entry.size / 1024:10.1f} KB - {entry.path}" for entry in entries[:100]]
+                if lines:
+                    sys.stdout.write('\n'.join(lines) + '\n')
+
+                if len(entries) > 100:
+                    print(f"\n... and {len(entries) - 100} more files")
+
+            elif command == 'extract':
+                if len(sys.argv) < 4:
+                    print("Error: Please specify file to extract")
+                    sys.exit(1)
+
+                file_path = sys.argv[3]
+                entries = reader.list_files()
+
+                # Find matching entry
+                entry = None
+                for e in entries:
+                    if e.path == file_path or e.path.endswith(file_path):
+                        entry = e
+                        break
 
-            file_path = sys.argv[3]
-            entries = reader.list_files()
+                if not entry:
+                    print(f"❌ File not found: {file_path}")
+                    sys.exit(1)
 
-            # Find matching entry
-            entry = None
-            for e in entries:
-                if e.path == file_path or e.path.endswith(file_path):
-                    entry = e
-                    break
+                output_path = Path('extracted') / entry.path
+                reader.extract_file(entry, output_path)
+                print(f"✅ Extracted: {entry.path} -> {output_path}")
 
-            if not entry:
-                print(f"❌ File not found: {file_path}")
+            else:
+                print(f"❌ Unknown command: {command}")
                 sys.exit(1)
 
-            output_path = Path('extracted') / entry.path
-            reader.extract_file(entry, output_path)
-            print(f"✅ Extracted: {entry.path} -> {output_path}")
-
-        else:
-            print(f"❌ Unknown command: {command}")
-            sys.exit(1)
-
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback